@@ -4,38 +4,129 @@ Data Science Project - IISc Bengaluru
 Author: Ayush Kumar Pushp
 """
 
+import os
+import matplotlib
+matplotlib.use('Agg')  # batch rendering; figures are only written to disk
 import matplotlib.pyplot as plt
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.colors import to_rgba
+from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
 import pandas as pd
 import numpy as np
-import seaborn as sns
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pv
+import argparse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import warnings
 warnings.filterwarnings('ignore')
 
+# Copy-on-write avoids defensive copies when columns are derived or replaced
+pd.options.mode.copy_on_write = True
+
 # Configure matplotlib for better plots
 plt.rcParams['figure.figsize'] = (12, 8)
 plt.rcParams['font.size'] = 10
 plt.style.use('seaborn-v0_8-whitegrid')
-sns.set_palette("husl")
+
+DATA_FILE = 'data.csv'
+CACHE_FILE = 'data.feather'
+REPORT_FILE = 'report.pdf'
+COLUMNS = ['Division', 'District', 'Active Registration', 'Male', 'Female', 'Other']
+NUMERIC_COLUMNS = ['Active Registration', 'Male', 'Female', 'Other']
+
+# Fast PNG output for screen use; --publish switches to full-resolution plots
+SCREEN_SAVEFIG_KWARGS = {'dpi': 150, 'bbox_inches': 'tight', 'pil_kwargs': {'compress_level': 1}}
+PUBLISH_SAVEFIG_KWARGS = {'dpi': 300, 'bbox_inches': 'tight'}
+
+# Shared style for outlier annotations on the scatter plot
+OUTLIER_BBOX = dict(boxstyle='round,pad=0.3', facecolor='yellow', alpha=0.7)
+
+# Neutral colour for scatter points whose Division is missing
+MISSING_DIVISION_COLOR = to_rgba('lightgrey')
+
+def _read_raw_data():
+    """Read data.csv, stripping thousands separators and 'NA' values in Arrow"""
+    table = pv.read_csv(DATA_FILE, convert_options=pv.ConvertOptions(
+        include_columns=COLUMNS,
+        column_types={col: pa.string() for col in NUMERIC_COLUMNS},
+        null_values=['NA', ''],
+        strings_can_be_null=True))
+    for col in NUMERIC_COLUMNS:
+        cleaned = pc.utf8_trim_whitespace(pc.replace_substring(table[col], ',', ''))
+        cleaned = pc.if_else(pc.equal(cleaned, ''), pa.scalar(None, pa.string()), cleaned)
+        
+        # Parse as float so counts like '1234.0', '+12' or '1e3' are accepted;
+        # only empty or 'NA' cells count as 0
+        try:
+            values = pc.fill_null(pc.cast(cleaned, pa.float64()), 0)
+        except pa.ArrowInvalid as e:
+            raise ValueError(f"Non-numeric value in '{col}' column of {DATA_FILE}: {e}") from e
+        if not pc.all(pc.equal(values, pc.floor(values))).as_py():
+            raise ValueError(f"Non-integer count in '{col}' column of {DATA_FILE}")
+        table = table.set_column(table.schema.get_field_index(col), col,
+                                 pc.cast(values, pa.int32()))
+    return table.to_pandas()
+
+def _scaled_ratio(numerator, denominator, scale):
+    """Compute numerator / denominator * scale in one buffer, 0 where the denominator is 0"""
+    out = np.zeros_like(numerator)
+    np.divide(numerator, denominator, out=out, where=denominator > 0)
+    out *= scale
+    return out
+
+def _clean_data():
+    """Read data.csv and add the derived metrics used by the analysis"""
+    df = _read_raw_data()
+    
+    # Calculate derived metrics
+    male = df['Male'].to_numpy(dtype=np.float64)
+    female = df['Female'].to_numpy(dtype=np.float64)
+    active = df['Active Registration'].to_numpy(dtype=np.float64)
+    return df.assign(
+        # Widen before adding so the int32 counts cannot overflow
+        Total_Registration=df[['Male', 'Female', 'Other']].astype(np.int64).sum(axis=1),
+        Gender_Ratio=_scaled_ratio(female, male, 1000),  # Females per 1000 males
+        Female_Percentage=_scaled_ratio(female, active, 100),
+        Male_Percentage=_scaled_ratio(male, active, 100),
+        # Dictionary-encode the labels so grouping works on integer codes
+        Division=df['Division'].astype('category'),
+        District=df['District'].astype('category'),
+    )
+
+def _read_cache():
+    """Return the cached cleaned frame, or None if it is missing, stale or unreadable"""
+    source_mtime = max(os.path.getmtime(DATA_FILE), os.path.getmtime(__file__))
+    if not os.path.exists(CACHE_FILE) or os.path.getmtime(CACHE_FILE) < source_mtime:
+        return None
+    try:
+        return pd.read_feather(CACHE_FILE)
+    except (OSError, pa.ArrowInvalid) as e:
+        print(f"Ignoring unreadable cache '{CACHE_FILE}' ({e}); rebuilding it")
+        return None
+
+def _write_cache(df):
+    """Write the cleaned frame atomically so an interrupted run cannot leave a truncated cache"""
+    tmp_file = f"{CACHE_FILE}.{os.getpid()}.tmp"
+    try:
+        df.reset_index(drop=True).to_feather(tmp_file)
+        os.replace(tmp_file, CACHE_FILE)
+    except OSError as e:
+        print(f"Could not write cache '{CACHE_FILE}' ({e}); continuing without it")
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
 
 def load_and_clean_data():
     """Load and preprocess the voter registration data"""
     print("Loading voter registration data...")
     
-    # Load data
-    df = pd.read_csv('data.csv')
-    
-    # Clean numeric columns (remove commas and handle 'NA' values)
-    numeric_columns = ['Active Registration', 'Male', 'Female', 'Other']
-    for col in numeric_columns:
-        df[col] = df[col].astype(str).str.replace(',', '').replace('NA', '0')
-        df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
-    
-    # Calculate derived metrics
-    df['Total_Registration'] = df['Male'] + df['Female'] + df['Other']
-    df['Gender_Ratio'] = (df['Female'] / df['Male']) * 1000  # Females per 1000 males
-    df['Female_Percentage'] = (df['Female'] / df['Active Registration']) * 100
-    df['Male_Percentage'] = (df['Male'] / df['Active Registration']) * 100
+    # Reuse the cleaned Feather cache unless data.csv or the cleaning code has changed since
+    df = _read_cache()
+    if df is None:
+        df = _clean_data()
+        _write_cache(df)
     
     print(f"Data loaded successfully. Shape: {df.shape}")
     print(f"Divisions: {df['Division'].nunique()}")
@@ -43,24 +134,66 @@ def load_and_clean_data():
     
     return df
 
-def generate_scatter_plot(df):
+def _top_k(df, column, k):
+    """Rows with the k largest values of column, in descending order
+
+    Ties are broken by row order, like df.nlargest(k, column, keep='first').
+    """
+    vals = df[column].to_numpy()
+    k = min(k, len(vals))
+    if k == 0:
+        return df.iloc[:0]
+    
+    # Everything above the k-th largest value qualifies; ties at it go by row order
+    kth = -np.partition(-vals, k - 1)[k - 1]
+    above = np.flatnonzero(vals > kth)
+    ties = np.flatnonzero(vals == kth)[:k - len(above)]
+    idx = np.sort(np.concatenate([above, ties]))
+    idx = idx[np.argsort(-vals[idx], kind='stable')]
+    return df.iloc[idx]
+
+def build_plot_context(df, publish=False):
+    """Precompute division lookups, colours and output settings shared by the plots"""
+    div_codes, divisions = pd.factorize(df['Division'])
+    n_divisions = len(divisions)
+    return {
+        'divisions': divisions,
+        'div_codes': div_codes,
+        'tab10': plt.cm.tab10(np.linspace(0, 1, n_divisions)),
+        'set3': plt.cm.Set3(np.linspace(0, 1, n_divisions)),
+        'top_districts': _top_k(df, 'Active Registration', 15),
+        'savefig_kwargs': PUBLISH_SAVEFIG_KWARGS if publish else SCREEN_SAVEFIG_KWARGS,
+    }
+
+def generate_scatter_plot(df, ctx):
     """Create scatter plot: Gender Ratio vs Registration Volume"""
-    fig, ax = plt.subplots(figsize=(14, 10))
-    
-    # Create scatter plot with division-wise coloring
-    divisions = df['Division'].unique()
-    colors = plt.cm.tab10(np.linspace(0, 1, len(divisions)))
-    
-    for i, division in enumerate(divisions):
-        division_data = df[df['Division'] == division]
-        scatter = ax.scatter(division_data['Active Registration'], 
-                           division_data['Gender_Ratio'],
-                           c=[colors[i]], 
-                           label=division,
-                           alpha=0.7,
-                           s=100,
-                           edgecolors='black',
-                           linewidth=0.5)
+    fig = Figure(figsize=(14, 10))
+    ax = fig.subplots()
+    
+    # Create scatter plot with division-wise coloring (one collection for all points)
+    colors = ctx['tab10']
+    codes = ctx['div_codes']
+    known = codes >= 0  # factorize marks a missing Division with -1
+    point_colors = np.tile(MISSING_DIVISION_COLOR, (len(codes), 1))
+    point_colors[known] = colors[codes[known]]
+    ax.scatter(df['Active Registration'].values,
+               df['Gender_Ratio'].values,
+               c=point_colors,
+               alpha=0.7,
+               s=100,
+               edgecolors='black',
+               linewidth=0.5,
+               rasterized=True)
+    
+    # Legend entries for each division
+    handles = [Line2D([0], [0], marker='o', linestyle='', label=division,
+                      markerfacecolor=colors[i], alpha=0.7,
+                      markeredgecolor='black', markeredgewidth=0.5, markersize=10)
+               for i, division in enumerate(ctx['divisions'])]
+    if not known.all():
+        handles.append(Line2D([0], [0], marker='o', linestyle='', label='Unknown division',
+                              markerfacecolor=MISSING_DIVISION_COLOR, alpha=0.7,
+                              markeredgecolor='black', markeredgewidth=0.5, markersize=10))
     
     # Formatting
     ax.set_xlabel('Active Registration', fontweight='bold', fontsize=12)
@@ -68,40 +201,45 @@ def generate_scatter_plot(df):
     ax.set_title('District-wise Gender Ratio vs Registration Volume\nMaharashtra Voter Data Analysis', 
                  fontweight='bold', fontsize=16, pad=20)
     
-    # Add trend line
-    z = np.polyfit(df['Active Registration'], df['Gender_Ratio'], 1)
-    p = np.poly1d(z)
-    ax.plot(df['Active Registration'], p(df['Active Registration']), 
-            "r--", alpha=0.8, linewidth=2, label=f'Trend line (slope: {z[0]:.4f})')
+    # Add trend line (a straight line only needs its two endpoints)
+    coef = np.polynomial.polynomial.polyfit(df['Active Registration'], df['Gender_Ratio'], 1)
+    xs = np.array([df['Active Registration'].min(), df['Active Registration'].max()])
+    trend, = ax.plot(xs, np.polynomial.polynomial.polyval(xs, coef), 
+                     "r--", alpha=0.8, linewidth=2, label=f'Trend line (slope: {coef[1]:.4f})')
+    handles.append(trend)
     
-    ax.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
+    ax.legend(handles=handles, bbox_to_anchor=(1.05, 1), loc='upper left')
     ax.grid(True, alpha=0.3)
     
     # Annotations for outliers
-    high_ratio = df[df['Gender_Ratio'] > 1500]
-    for _, row in high_ratio.iterrows():
-        ax.annotate(f"{row['District']}\n({row['Gender_Ratio']:.0f})", 
-                   (row['Active Registration'], row['Gender_Ratio']),
+    high_ratio = df.loc[df['Gender_Ratio'].values > 1500,
+                        ['District', 'Gender_Ratio', 'Active Registration']]
+    for district, ratio, registration in high_ratio.itertuples(index=False, name=None):
+        ax.annotate(f"{district}\n({ratio:.0f})", 
+                   (registration, ratio),
                    xytext=(10, 10), textcoords='offset points',
-                   bbox=dict(boxstyle='round,pad=0.3', facecolor='yellow', alpha=0.7),
+                   bbox=OUTLIER_BBOX,
                    fontsize=8)
     
-    plt.tight_layout()
-    plt.savefig('scatter_plot.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    fig.tight_layout()
+    fig.savefig('scatter_plot.png', **ctx['savefig_kwargs'])
     
-    print("Scatter plot saved as 'scatter_plot.png'")
+    return fig
 
-def generate_box_plot(df):
+def generate_box_plot(df, ctx):
     """Create box plot: Registration distribution by Division"""
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 8))
+    fig = Figure(figsize=(16, 8))
+    ax1, ax2 = fig.subplots(1, 2)
     
-    # Box plot 1: Registration by Division
-    box_data = [df[df['Division'] == div]['Active Registration'].values 
-                for div in df['Division'].unique()]
+    # Split both metrics by division in a single grouping pass
+    groups = df.groupby('Division', sort=False, observed=True)
+    labels = ctx['divisions']
+    box_data = [group['Active Registration'].values for _, group in groups]
+    box_data2 = [group['Gender_Ratio'].values for _, group in groups]
     
-    bp1 = ax1.boxplot(box_data, labels=df['Division'].unique(), patch_artist=True)
-    colors = plt.cm.Set3(np.linspace(0, 1, len(bp1['boxes'])))
+    # Box plot 1: Registration by Division
+    bp1 = ax1.boxplot(box_data, labels=labels, patch_artist=True)
+    colors = ctx['set3']
     for patch, color in zip(bp1['boxes'], colors):
         patch.set_facecolor(color)
         patch.set_alpha(0.7)
@@ -112,10 +250,7 @@ def generate_box_plot(df):
     ax1.grid(True, alpha=0.3)
     
     # Box plot 2: Gender Ratio by Division
-    box_data2 = [df[df['Division'] == div]['Gender_Ratio'].values 
-                 for div in df['Division'].unique()]
-    
-    bp2 = ax2.boxplot(box_data2, labels=df['Division'].unique(), patch_artist=True)
+    bp2 = ax2.boxplot(box_data2, labels=labels, patch_artist=True)
     for patch, color in zip(bp2['boxes'], colors):
         patch.set_facecolor(color)
         patch.set_alpha(0.7)
@@ -125,43 +260,39 @@ def generate_box_plot(df):
     ax2.tick_params(axis='x', rotation=45)
     ax2.grid(True, alpha=0.3)
     
-    plt.tight_layout()
-    plt.savefig('box_plot.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    fig.tight_layout()
+    fig.savefig('box_plot.png', **ctx['savefig_kwargs'])
     
-    print("Box plot saved as 'box_plot.png'")
+    return fig
 
-def generate_bar_plot(df):
+def generate_bar_plot(df, ctx):
     """Create bar plot: Top districts and division comparison"""
-    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(16, 12))
+    fig = Figure(figsize=(16, 12))
+    ax1, ax2 = fig.subplots(2, 1)
     
     # Bar plot 1: Top 15 districts by registration
-    top_districts = df.nlargest(15, 'Active Registration')
+    top_districts = ctx['top_districts']
     bars1 = ax1.bar(range(len(top_districts)), top_districts['Active Registration'],
                     color=plt.cm.viridis(np.linspace(0, 1, len(top_districts))))
     
     ax1.set_title('Top 15 Districts by Active Registration', fontweight='bold', fontsize=14)
     ax1.set_ylabel('Active Registration', fontweight='bold')
     ax1.set_xticks(range(len(top_districts)))
-    ax1.set_xticklabels([f"{row['District']}\n({row['Division']})" 
-                        for _, row in top_districts.iterrows()], 
+    ax1.set_xticklabels([f"{district}\n({division})" 
+                        for district, division in zip(top_districts['District'], top_districts['Division'])], 
                        rotation=45, ha='right', fontsize=10)
     
     # Add value labels on bars
-    for i, (_, row) in enumerate(top_districts.iterrows()):
-        ax1.text(i, row['Active Registration'] + max(top_districts['Active Registration']) * 0.01, 
-                f'{row["Active Registration"]:,.0f}', ha='center', va='bottom', 
+    max_reg = top_districts['Active Registration'].max()
+    for i, registration in enumerate(top_districts['Active Registration']):
+        ax1.text(i, registration + max_reg * 0.01, 
+                f'{registration:,.0f}', ha='center', va='bottom', 
                 fontweight='bold', fontsize=9, rotation=90)
     
     ax1.grid(True, alpha=0.3, axis='y')
     
     # Bar plot 2: Division-wise statistics
-    division_stats = df.groupby('Division').agg({
-        'Active Registration': 'sum',
-        'Male': 'sum', 
-        'Female': 'sum',
-        'Gender_Ratio': 'mean'
-    }).round(0)
+    division_stats = df.groupby('Division', observed=True)[['Male', 'Female']].sum()
     
     x = np.arange(len(division_stats))
     width = 0.35
@@ -178,13 +309,21 @@ def generate_bar_plot(df):
     ax2.legend()
     ax2.grid(True, alpha=0.3, axis='y')
     
-    plt.tight_layout()
-    plt.savefig('bar_plot.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    fig.tight_layout()
+    fig.savefig('bar_plot.png', **ctx['savefig_kwargs'])
     
-    print("Bar plot saved as 'bar_plot.png'")
+    return fig
+
+def _grouped_sum_mean(codes, values, n_groups):
+    """Per-group sum and mean of values, keyed by integer group codes"""
+    # Code -1 marks a missing key; groupby would drop those rows too
+    mask = codes >= 0
+    codes, values = codes[mask], values[mask]
+    sums = np.bincount(codes, weights=values, minlength=n_groups)
+    counts = np.bincount(codes, minlength=n_groups)
+    return sums, sums / counts
 
-def generate_summary_statistics(df):
+def generate_summary_statistics(df, ctx):
     """Generate and display summary statistics"""
     print("\n" + "="*60)
     print("SUMMARY STATISTICS - MAHARASHTRA VOTER REGISTRATION")
@@ -201,52 +340,75 @@ def generate_summary_statistics(df):
     
     # Division-wise statistics
     print(f"\nDIVISION-WISE STATISTICS:")
-    division_summary = df.groupby('Division').agg({
-        'Active Registration': ['sum', 'mean'],
-        'Gender_Ratio': 'mean',
-        'Female_Percentage': 'mean'
-    }).round(1)
+    codes, divisions = pd.factorize(df['Division'], sort=True)
+    n_groups = len(divisions)
+    reg_sum, reg_mean = _grouped_sum_mean(codes, df['Active Registration'].values, n_groups)
+    _, ratio_mean = _grouped_sum_mean(codes, df['Gender_Ratio'].values, n_groups)
+    _, female_mean = _grouped_sum_mean(codes, df['Female_Percentage'].values, n_groups)
+    division_summary = pd.DataFrame({
+        ('Active Registration', 'sum'): reg_sum.astype(np.int64),
+        ('Active Registration', 'mean'): reg_mean,
+        ('Gender_Ratio', 'mean'): ratio_mean,
+        ('Female_Percentage', 'mean'): female_mean
+    }, index=pd.Index(divisions, name='Division')).round(1)
     
     print(division_summary.to_string())
     
     # Top and bottom districts
     print(f"\nTOP 5 DISTRICTS BY REGISTRATION:")
-    top5 = df.nlargest(5, 'Active Registration')[['District', 'Division', 'Active Registration', 'Gender_Ratio']]
+    top5 = ctx['top_districts'].head(5)[['District', 'Division', 'Active Registration', 'Gender_Ratio']]
     print(top5.to_string(index=False))
     
     print(f"\nTOP 5 DISTRICTS BY GENDER RATIO:")
-    top5_gender = df.nlargest(5, 'Gender_Ratio')[['District', 'Division', 'Gender_Ratio', 'Active Registration']]
+    top5_gender = _top_k(df, 'Gender_Ratio', 5)[['District', 'Division', 'Gender_Ratio', 'Active Registration']]
     print(top5_gender.to_string(index=False))
 
 def main():
     """Main analysis function"""
+    parser = argparse.ArgumentParser(description='Maharashtra Voter Registration Data Analysis')
+    parser.add_argument('--publish', action='store_true',
+                        help='save plots at 300 dpi for publication')
+    args = parser.parse_args()
+    
     print("Maharashtra Voter Registration Data Analysis")
     print("=" * 50)
     
     # Load and clean data
     df = load_and_clean_data()
+    ctx = build_plot_context(df, publish=args.publish)
     
     # Generate all plots
     print("\nGenerating visualizations...")
     
-    print("\n1. Creating Scatter Plot...")
-    generate_scatter_plot(df)
-    
-    print("\n2. Creating Box Plot...")
-    generate_box_plot(df)
-    
-    print("\n3. Creating Bar Plot...")
-    generate_bar_plot(df)
+    # The plots are independent and Agg releases the GIL while rendering
+    plot_jobs = [('Scatter Plot', generate_scatter_plot, 'scatter_plot.png'),
+                 ('Box Plot', generate_box_plot, 'box_plot.png'),
+                 ('Bar Plot', generate_bar_plot, 'bar_plot.png')]
+    with ThreadPoolExecutor(max_workers=len(plot_jobs)) as executor, PdfPages(REPORT_FILE) as pdf:
+        futures = []
+        for i, (name, plot, _) in enumerate(plot_jobs, 1):
+            print(f"{i}. Creating {name}...")
+            futures.append(executor.submit(plot, df, ctx))
+        
+        # Add each figure to the report in plot order as soon as it is ready,
+        # then drop every reference so its memory can be released
+        for i, (name, _, filename) in enumerate(plot_jobs):
+            fig = futures[i].result()
+            futures[i] = None
+            pdf.savefig(fig, dpi=ctx['savefig_kwargs']['dpi'], bbox_inches='tight')
+            del fig
+            print(f"{name.capitalize()} saved as '{filename}'")
+    print(f"Combined report saved as '{REPORT_FILE}'")
     
     # Generate summary statistics
-    generate_summary_statistics(df)
+    generate_summary_statistics(df, ctx)
     
     print("\n" + "="*60)
     print("ANALYSIS COMPLETE!")
     print("Generated files:")
-    print("- scatter_plot.png")
-    print("- box_plot.png") 
-    print("- bar_plot.png")
+    for _, _, filename in plot_jobs:
+        print(f"- {filename}")
+    print(f"- {REPORT_FILE}")
     print("="*60)
 
 if __name__ == "__main__":